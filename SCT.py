@@ -1,9 +1,38 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import hashlib
+import threading
+import time
+from pathlib import Path
+from joblib import Memory
+import requests
+from requests.adapters import HTTPAdapter
 import yfinance as yf
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import ta
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from fast_ta import all_indicators, batch_indicators, lttb_indices, warmup
+from spark import parse_spark
+
+# On-disk cache shared across sessions and restarts
+CACHE_DIR = Path(".cache")
+mem = Memory(CACHE_DIR / "joblib", verbose=0)
+DISK_CACHE_BYTES = "100M"
+DISK_CACHE_AGE = timedelta(days=1)
+
+# Info fields the Ratios section reads
+INFO_KEYS = ('trailingPE', 'trailingEps', 'returnOnEquity', 'debtToEquity', 'priceToBook', 'marketCap')
+
+# Maximum number of bars sent to the price chart
+MAX_CHART_POINTS = 1000
+
+# Yahoo spark endpoint: daily closes for up to 20 symbols per request
+SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+SPARK_BATCH = 20
+SPARK_RANGES = [("1mo", 31), ("3mo", 92), ("6mo", 183), ("1y", 366), ("2y", 731), ("5y", 1827), ("10y", 3653)]
 
 # Page config
 st.set_page_config(
@@ -41,148 +70,344 @@ indicators = st.sidebar.multiselect(
     default=['SMA (20)', 'RSI']
 )
 
+compare = st.sidebar.text_input("Compare with (comma-separated tickers):", "").upper()
+compare_tickers = tuple(t.strip() for t in compare.split(",") if t.strip() and t.strip() != ticker)
+
+active_tab = st.sidebar.radio(
+    "Section",
+    ["Chart", "Ratios", "News", "Raw"],
+    key="active_tab"
+)
+
 # Load data
+def flatten_columns(df):
+    # yfinance returns (Price, Ticker) columns; keep the single-ticker level
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+# Drop expired entries so the disk cache stays bounded
+def _prune_disk_cache():
+    mem.reduce_size(bytes_limit=DISK_CACHE_BYTES, age_limit=DISK_CACHE_AGE)
+    # Cached prices are split/dividend adjusted as of download, so they expire too
+    cutoff = time.time() - DISK_CACHE_AGE.total_seconds()
+    for path in (CACHE_DIR / "ohlc").glob("*.parquet"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
 @st.cache_data
 def load_data(ticker, start, end):
-    df = yf.download(ticker, start=start, end=end)
+    _prune_disk_cache()
+    # Keyed by hash so user-typed tickers can't form paths outside the cache
+    key = hashlib.sha1(f"{ticker}|{start}|{end}".encode()).hexdigest()
+    path = CACHE_DIR / "ohlc" / f"{key}.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
+    df = flatten_columns(yf.download(ticker, start=start, end=end))
     df.reset_index(inplace=True)
+    # Only persist closed ranges; a range reaching today is still filling in
+    if not df.empty and end < date.today():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path)
     return df
 
-data = load_data(ticker, start_date, end_date)
+@st.cache_resource
+def http_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    session.headers["User-Agent"] = "Mozilla/5.0"
+    return session
+
+@st.cache_data(ttl=3600)
+def load_data_multi(tickers, start, end):
+    days = (date.today() - start).days
+    period = next((r for r, d in SPARK_RANGES if days <= d), "max")
+    frames = {}
+    for i in range(0, len(tickers), SPARK_BATCH):
+        symbols = ",".join(tickers[i:i + SPARK_BATCH])
+        resp = http_session().get(SPARK_URL, params={"symbols": symbols, "range": period, "interval": "1d"}, timeout=10)
+        resp.raise_for_status()
+        frames.update(parse_spark(resp.json(), start, end))
+    return frames
+
+@mem.cache
+def _fetch_info(ticker, day):
+    return yf.Ticker(ticker).info
+
+@mem.cache
+def _fetch_news(ticker, hour):
+    return yf.Ticker(ticker).news
+
+@st.cache_data(ttl=3600)
+def load_info(ticker):
+    shelved = _fetch_info.call_and_shelve(ticker, date.today().isoformat())
+    info = shelved.get()
+    # Rate-limited responses come back nearly empty; don't keep them for the day
+    if not any(info.get(k) is not None for k in INFO_KEYS):
+        shelved.clear()
+    _prune_disk_cache()
+    return info
+
+@st.cache_data(ttl=3600)
+def load_news(ticker):
+    news = _fetch_news(ticker, datetime.now().strftime("%Y-%m-%d %H"))
+    _prune_disk_cache()
+    return news
+
+# VADER's lexicon is read once per server process; no NLTK corpora are needed
+@st.cache_resource
+def load_sentiment_analyzer():
+    return SentimentIntensityAnalyzer()
+
+# Fetch price history alongside whatever the visible section needs; workers
+# share this run's ScriptRunContext so cached loaders behave as on the main thread
+with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+    data_future = executor.submit(load_data, ticker, start_date, end_date)
+    if active_tab == "Ratios":
+        info_future = executor.submit(load_info, ticker)
+    if active_tab == "News":
+        news_future = executor.submit(load_news, ticker)
+        sia_future = executor.submit(load_sentiment_analyzer)
+
+data = data_future.result()
 
 # Validate 'Close'
 if 'Close' not in data.columns:
     st.error("❌ 'Close' column not found in data.")
     st.stop()
 
-close_col = data['Close']  # ✅ FIXED: keep as Series
-
-if close_col.isnull().all():
+# Downstream code works on plain arrays; data is kept only for the raw table
+close = np.ascontiguousarray(data['Close'].to_numpy(dtype=np.float64, na_value=np.nan))
+if np.isnan(close).all():
     st.error("❌ Invalid or missing closing price data.")
     st.stop()
 
+arrays = {c: data[c].to_numpy() for c in ('Open', 'High', 'Low', 'Date')}
+arrays['Close'] = close
+
 # Technical indicators
+# Numba's fallback workqueue threading layer aborts if two threads launch
+# parallel kernels at once, and every session runs on its own thread.
+# The script re-executes per rerun, so the lock lives in cache_resource.
+@st.cache_resource
+def parallel_kernel_lock():
+    return threading.Lock()
+
+@st.cache_resource
+def _warm():
+    with parallel_kernel_lock():
+        warmup()
+    return True
+
+_warm()
+
+# Memoized on the close array's contents, so widget changes reuse earlier results
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_indicators(close):
+    # float32 halves the typed-array payload Plotly ships to the browser
+    return all_indicators(close, 20, 20, 14, 12, 26, 9).astype(np.float32)
+
+# Latest RSI/MACD per ticker; closes is (N, T) with one row per ticker
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_batch_signals(closes):
+    # No bars in range for any ticker: nothing to report
+    if closes.shape[1] == 0:
+        return np.full((closes.shape[0], 5), np.nan)
+    with parallel_kernel_lock():
+        return batch_indicators(closes, 20, 20, 14, 12, 26, 9)[:, -1, :]
+
+if indicators:
+    values = compute_indicators(close)
+
 if 'SMA (20)' in indicators:
-    data['SMA20'] = ta.trend.sma_indicator(close=close_col, window=20)
+    arrays['SMA20'] = values[:, 0]
 
 if 'EMA (20)' in indicators:
-    data['EMA20'] = ta.trend.ema_indicator(close=close_col, window=20)
+    arrays['EMA20'] = values[:, 1]
 
 if 'RSI' in indicators:
-    data['RSI'] = ta.momentum.rsi(close=close_col, window=14)
+    arrays['RSI'] = values[:, 2]
 
 if 'MACD' in indicators:
+    arrays['MACD'] = values[:, 3]
+    arrays['Signal_Line'] = values[:, 4]
+
+# Figures are cached on the content of their input arrays
+FIGURE_HASH_FUNCS = {np.ndarray: lambda a: hashlib.md5(a.tobytes()).digest()}
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs=FIGURE_HASH_FUNCS)
+def build_price_figure(dates, o, h, l, c, sma20, ema20, ticker):
+    # Long histories are downsampled (LTTB on close) before rendering
+    idx = lttb_indices(c, MAX_CHART_POINTS)
+    x = dates[idx]
+
+    def values(a):
+        return a.astype(np.float32, copy=False)[idx]
+
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(
+        x=x,
+        open=values(o),
+        high=values(h),
+        low=values(l),
+        close=values(c),
+        name='Candlestick'
+    ))
+    if sma20 is not None:
+        fig.add_trace(go.Scatter(x=x, y=values(sma20), name='SMA 20', line=dict(color='blue')))
+    if ema20 is not None:
+        fig.add_trace(go.Scatter(x=x, y=values(ema20), name='EMA 20', line=dict(color='orange')))
+    fig.update_layout(xaxis_rangeslider_visible=False, template='plotly_white', height=600, uirevision=ticker)
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs=FIGURE_HASH_FUNCS)
+def build_rsi_figure(dates, rsi):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=dates, y=rsi, line=dict(color='purple'), name='RSI'))
+    fig.add_hline(y=70, line_dash="dash", line_color="red")
+    fig.add_hline(y=30, line_dash="dash", line_color="green")
+    fig.update_layout(template='plotly_white', height=300)
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs=FIGURE_HASH_FUNCS)
+def build_macd_figure(dates, macd_line, signal_line):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=dates, y=macd_line, name='MACD', line=dict(color='blue')))
+    fig.add_trace(go.Scatter(x=dates, y=signal_line, name='Signal Line', line=dict(color='red')))
+    fig.update_layout(template='plotly_white', height=300)
+    return fig
+
+# Only the visible section is built; the others cost nothing on rerun
+if active_tab == "Chart":
+    # Candlestick chart
+    st.subheader(f"📉 Price Chart for {ticker}")
+    fig = build_price_figure(
+        arrays['Date'], arrays['Open'], arrays['High'], arrays['Low'], close,
+        arrays.get('SMA20'), arrays.get('EMA20'), ticker
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # RSI chart
+    if 'RSI' in indicators and 'RSI' in arrays:
+        st.subheader("📊 RSI (Relative Strength Index)")
+        st.plotly_chart(build_rsi_figure(arrays['Date'], arrays['RSI']), use_container_width=True)
+
+    # MACD chart
+    if 'MACD' in indicators and 'MACD' in arrays:
+        st.subheader("📊 MACD")
+        st.plotly_chart(build_macd_figure(arrays['Date'], arrays['MACD'], arrays['Signal_Line']), use_container_width=True)
+
+    # Key Metrics
+    st.subheader("📈 Key Metrics")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Latest Close", f"${float(close[-1]):.2f}")
+    col2.metric("52W High", f"${float(np.nanmax(arrays['High'])):.2f}")
+    col3.metric("52W Low", f"${float(np.nanmin(arrays['Low'])):.2f}")
+
+    # Relative performance against the comparison tickers
+    if compare_tickers:
+        st.subheader("📊 Relative Performance")
+        try:
+            closes = load_data_multi((ticker,) + compare_tickers, start_date, end_date)
+            fig_cmp = go.Figure()
+            for symbol, df in closes.items():
+                series = df['Close'].to_numpy(dtype=np.float32)
+                first = series[~np.isnan(series)][:1]
+                if first.size:
+                    fig_cmp.add_trace(go.Scatter(x=df['Date'].values, y=series / first[0] * 100, name=symbol))
+            fig_cmp.update_layout(template='plotly_white', height=400, yaxis_title='Rebased to 100', uirevision=ticker)
+            st.plotly_chart(fig_cmp, use_container_width=True)
+
+            # Align every ticker on a shared calendar, carrying prices over market holidays
+            aligned = pd.concat({symbol: df.set_index('Date')['Close'] for symbol, df in closes.items()}, axis=1).sort_index().ffill()
+            signals = compute_batch_signals(np.ascontiguousarray(aligned.to_numpy(dtype=np.float64, na_value=np.nan).T))
+            macd_last, signal_last = signals[:, 3], signals[:, 4]
+            trend = np.select(
+                [np.isnan(macd_last) | np.isnan(signal_last), macd_last > signal_last, macd_last < signal_last],
+                ['N/A', 'Bullish', 'Bearish'],
+                default='Neutral'
+            )
+            st.dataframe(pd.DataFrame({
+                'RSI (14)': signals[:, 2],
+                'MACD': macd_last,
+                'Signal Line': signal_last,
+                'Trend': trend,
+            }, index=aligned.columns).round(2), use_container_width=True)
+        except (requests.RequestException, ValueError) as e:
+            st.warning(f"Comparison data not available: {e}")
+
+    # Investment Insights
+    st.subheader("💡 Investment Insights")
+    if 'RSI' in indicators and 'RSI' in arrays:
+        rsi = arrays['RSI'][-1]
+        if rsi > 70:
+            st.warning("RSI indicates the stock is overbought – Consider waiting.")
+        elif rsi < 30:
+            st.success("RSI indicates oversold – Possible buying opportunity.")
+        else:
+            st.info("RSI is neutral.")
+
+    if 'MACD' in indicators and 'MACD' in arrays:
+        macd_val = arrays['MACD'][-1]
+        signal_val = arrays['Signal_Line'][-1]
+        if macd_val > signal_val:
+            st.success("MACD crossover: Bullish signal.")
+        elif macd_val < signal_val:
+            st.warning("MACD crossover: Bearish signal.")
+        else:
+            st.info("MACD is neutral.")
+
+elif active_tab == "Ratios":
+    # Fundamental ratios
+    st.subheader("📘 Fundamental Ratio Analysis")
+    info = info_future.result()
+
+    col4, col5, col6 = st.columns(3)
+    col4.metric("P/E Ratio", f"{info.get('trailingPE', 'N/A')}")
+    col5.metric("EPS (TTM)", f"{info.get('trailingEps', 'N/A')}")
+    roe = info.get('returnOnEquity')
+    col6.metric("ROE", f"{roe * 100:.2f}%" if roe else "N/A")
+
+    col7, col8, col9 = st.columns(3)
+    col7.metric("Debt/Equity", f"{info.get('debtToEquity', 'N/A')}")
+    col8.metric("P/B Ratio", f"{info.get('priceToBook', 'N/A')}")
+    col9.metric("Market Cap", f"${info.get('marketCap', 0):,.0f}")
+
+elif active_tab == "News":
+    # News Sentiment
+    st.subheader("🗞 News Sentiment Analysis")
     try:
-        macd = ta.trend.macd(close=close_col)
-        data['MACD'] = macd.macd()
-        data['Signal_Line'] = macd.macd_signal()
-    except Exception as e:
-        st.warning(f"MACD error: {e}")
-        data['MACD'] = data['Signal_Line'] = None
-
-# Candlestick chart
-st.subheader(f"📉 Price Chart for {ticker}")
-fig = go.Figure()
-fig.add_trace(go.Candlestick(
-    x=data['Date'],
-    open=data['Open'],
-    high=data['High'],
-    low=data['Low'],
-    close=data['Close'],
-    name='Candlestick'
-))
-if 'SMA (20)' in indicators and 'SMA20' in data:
-    fig.add_trace(go.Scatter(x=data['Date'], y=data['SMA20'], name='SMA 20', line=dict(color='blue')))
-if 'EMA (20)' in indicators and 'EMA20' in data:
-    fig.add_trace(go.Scatter(x=data['Date'], y=data['EMA20'], name='EMA 20', line=dict(color='orange')))
-fig.update_layout(xaxis_rangeslider_visible=False, template='plotly_white', height=600)
-st.plotly_chart(fig, use_container_width=True)
-
-# RSI chart
-if 'RSI' in indicators and 'RSI' in data:
-    st.subheader("📊 RSI (Relative Strength Index)")
-    fig_rsi = go.Figure()
-    fig_rsi.add_trace(go.Scatter(x=data['Date'], y=data['RSI'], line=dict(color='purple'), name='RSI'))
-    fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-    fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-    fig_rsi.update_layout(template='plotly_white', height=300)
-    st.plotly_chart(fig_rsi, use_container_width=True)
-
-# MACD chart
-if 'MACD' in indicators and data.get('MACD') is not None:
-    st.subheader("📊 MACD")
-    fig_macd = go.Figure()
-    fig_macd.add_trace(go.Scatter(x=data['Date'], y=data['MACD'], name='MACD', line=dict(color='blue')))
-    fig_macd.add_trace(go.Scatter(x=data['Date'], y=data['Signal_Line'], name='Signal Line', line=dict(color='red')))
-    fig_macd.update_layout(template='plotly_white', height=300)
-    st.plotly_chart(fig_macd, use_container_width=True)
-
-# Key Metrics
-st.subheader("📈 Key Metrics")
-col1, col2, col3 = st.columns(3)
-col1.metric("Latest Close", f"${float(data['Close'].iloc[-1]):.2f}")
-col2.metric("52W High", f"${float(data['High'].max()):.2f}")
-col3.metric("52W Low", f"${float(data['Low'].min()):.2f}")
-
-# Fundamental ratios
-st.subheader("📘 Fundamental Ratio Analysis")
-ticker_obj = yf.Ticker(ticker)
-info = ticker_obj.info
-
-col4, col5, col6 = st.columns(3)
-col4.metric("P/E Ratio", f"{info.get('trailingPE', 'N/A')}")
-col5.metric("EPS (TTM)", f"{info.get('trailingEps', 'N/A')}")
-roe = info.get('returnOnEquity')
-col6.metric("ROE", f"{roe * 100:.2f}%" if roe else "N/A")
-
-col7, col8, col9 = st.columns(3)
-col7.metric("Debt/Equity", f"{info.get('debtToEquity', 'N/A')}")
-col8.metric("P/B Ratio", f"{info.get('priceToBook', 'N/A')}")
-col9.metric("Market Cap", f"${info.get('marketCap', 0):,.0f}")
-
-# Investment Insights
-st.subheader("💡 Investment Insights")
-if 'RSI' in indicators and 'RSI' in data:
-    rsi = data['RSI'].iloc[-1]
-    if rsi > 70:
-        st.warning("RSI indicates the stock is overbought – Consider waiting.")
-    elif rsi < 30:
-        st.success("RSI indicates oversold – Possible buying opportunity.")
-    else:
-        st.info("RSI is neutral.")
-
-if 'MACD' in indicators and data.get('MACD') is not None:
-    macd_val = data['MACD'].iloc[-1]
-    signal_val = data['Signal_Line'].iloc[-1]
-    if macd_val > signal_val:
-        st.success("MACD crossover: Bullish signal.")
-    elif macd_val < signal_val:
-        st.warning("MACD crossover: Bearish signal.")
-    else:
-        st.info("MACD is neutral.")
-
-# News Sentiment
-st.subheader("🗞 News Sentiment Analysis")
-try:
-    news = ticker_obj.news
-    if news:
-        for item in news[:5]:
-            title = item['title']
-            sentiment = TextBlob(title).sentiment.polarity
-            if sentiment > 0.1:
-                st.success(f"🔼 {title}")
-            elif sentiment < -0.1:
-                st.error(f"🔻 {title}")
-            else:
-                st.info(f"➖ {title}")
-    else:
-        st.write("No recent news available.")
-except:
-    st.warning("Sentiment analysis not available.")
-
-# Raw data
-with st.expander("📋 View Raw Data"):
-    st.dataframe(data.tail(100))
+        news = news_future.result()
+        if news:
+            sia = sia_future.result()
+            titles = [item['title'] for item in news[:5]]
+            scores = [sia.polarity_scores(t)['compound'] for t in titles]
+            for title, sentiment in zip(titles, scores):
+                if sentiment > 0.05:
+                    st.success(f"🔼 {title}")
+                elif sentiment < -0.05:
+                    st.error(f"🔻 {title}")
+                else:
+                    st.info(f"➖ {title}")
+        else:
+            st.write("No recent news available.")
+    except:
+        st.warning("Sentiment analysis not available.")
+
+else:
+    # Raw data
+    st.subheader("📋 Raw Data")
+    # Only the displayed columns are serialized, as float32 where possible
+    raw = data[[c for c in ('Date', 'Open', 'High', 'Low', 'Close', 'Volume') if c in data]].tail(100).reset_index(drop=True)
+    prices = [c for c in ('Open', 'High', 'Low', 'Close') if c in raw]
+    raw[prices] = raw[prices].astype('float32')
+    for col in ('SMA20', 'EMA20', 'RSI', 'MACD', 'Signal_Line'):
+        if col in arrays:
+            raw[col] = arrays[col][-100:].astype('float32')
+    st.dataframe(raw, use_container_width=True)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,218 @@
+import numpy as np
+from numba import njit, prange
+
+
+# Per-indicator reference kernels; the app uses all_indicators, these back its tests
+
+# Simple moving average (NaN until a full window of valid prices is seen)
+@njit(cache=True)
+def sma(a, w):
+    n = a.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    valid = 0
+    for i in range(n):
+        x = a[i]
+        if not np.isnan(x):
+            total += x
+            valid += 1
+        if i >= w:
+            old = a[i - w]
+            if not np.isnan(old):
+                total -= old
+                valid -= 1
+        if valid == w:
+            out[i] = total / w
+    return out
+
+
+# Exponential recurrence shared by EMA, RSI and MACD (matches pandas ewm(adjust=False))
+@njit(cache=True)
+def _ewm(a, alpha, min_periods):
+    n = a.shape[0]
+    out = np.full(n, np.nan)
+    e = np.nan
+    seen = 0
+    for i in range(n):
+        x = a[i]
+        if not np.isnan(x):
+            if seen == 0:
+                e = x
+            else:
+                e = alpha * x + (1.0 - alpha) * e
+            seen += 1
+        if seen >= min_periods:
+            out[i] = e
+    return out
+
+
+# Exponential moving average
+@njit(cache=True)
+def ema(a, w):
+    return _ewm(a, 2.0 / (w + 1.0), w)
+
+
+# Relative Strength Index with Wilder smoothing
+@njit(cache=True)
+def rsi(a, w):
+    n = a.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    alpha = 1.0 / w
+    up = 0.0
+    down = 0.0
+    diffs = 0
+    for i in range(n):
+        diff = a[i] - a[i - 1] if i > 0 else 0.0
+        if not np.isnan(diff) and i > 0:
+            diffs += 1
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        if i == 0:
+            up = gain
+            down = loss
+        else:
+            up = alpha * gain + (1.0 - alpha) * up
+            down = alpha * loss + (1.0 - alpha) * down
+        # Same warm-up as ta (w prices, i.e. w - 1 diffs), but only counting real diffs
+        if diffs >= w - 1:
+            out[i] = 100.0 if down == 0 else 100.0 - 100.0 / (1.0 + up / down)
+    return out
+
+
+# MACD line and its signal line
+@njit(cache=True)
+def macd(a, fast, slow, sig):
+    line = ema(a, fast) - ema(a, slow)
+    signal = ema(line, sig)
+    return line, signal
+
+
+# SMA, EMA, RSI, MACD and MACD signal in a single pass; columns in that order
+@njit(cache=True)
+def all_indicators(a, sma_w, ema_w, rsi_w, fast, slow, sig):
+    n = a.shape[0]
+    out = np.full((n, 5), np.nan)
+    a_ema = 2.0 / (ema_w + 1.0)
+    a_fast = 2.0 / (fast + 1.0)
+    a_slow = 2.0 / (slow + 1.0)
+    a_sig = 2.0 / (sig + 1.0)
+    a_rsi = 1.0 / rsi_w
+    total = 0.0
+    valid = 0
+    e_ema = e_fast = e_slow = e_sig = np.nan
+    seen = 0
+    sig_seen = 0
+    up = 0.0
+    down = 0.0
+    diffs = 0
+    for i in range(n):
+        x = a[i]
+
+        # SMA: rolling sum over the last sma_w prices
+        if not np.isnan(x):
+            total += x
+            valid += 1
+        if i >= sma_w:
+            old = a[i - sma_w]
+            if not np.isnan(old):
+                total -= old
+                valid -= 1
+        if valid == sma_w:
+            out[i, 0] = total / sma_w
+
+        # EMA and the two MACD EMAs share the same observation count
+        if not np.isnan(x):
+            if seen == 0:
+                e_ema = e_fast = e_slow = x
+            else:
+                e_ema = a_ema * x + (1.0 - a_ema) * e_ema
+                e_fast = a_fast * x + (1.0 - a_fast) * e_fast
+                e_slow = a_slow * x + (1.0 - a_slow) * e_slow
+            seen += 1
+        if seen >= ema_w:
+            out[i, 1] = e_ema
+
+        # RSI: Wilder-smoothed gains and losses
+        diff = x - a[i - 1] if i > 0 else 0.0
+        if not np.isnan(diff) and i > 0:
+            diffs += 1
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        if i == 0:
+            up = gain
+            down = loss
+        else:
+            up = a_rsi * gain + (1.0 - a_rsi) * up
+            down = a_rsi * loss + (1.0 - a_rsi) * down
+        if diffs >= rsi_w - 1:
+            out[i, 2] = 100.0 if down == 0 else 100.0 - 100.0 / (1.0 + up / down)
+
+        # MACD line and its signal EMA
+        if seen >= fast and seen >= slow:
+            line = e_fast - e_slow
+            out[i, 3] = line
+            if sig_seen == 0:
+                e_sig = line
+            else:
+                e_sig = a_sig * line + (1.0 - a_sig) * e_sig
+            sig_seen += 1
+            if sig_seen >= sig:
+                out[i, 4] = e_sig
+    return out
+
+
+# all_indicators for each row of a (N, T) close matrix, one ticker per thread
+@njit(parallel=True, cache=True)
+def batch_indicators(closes, sma_w, ema_w, rsi_w, fast, slow, sig):
+    n, t = closes.shape
+    out = np.empty((n, t, 5))
+    for k in prange(n):
+        out[k] = all_indicators(closes[k], sma_w, ema_w, rsi_w, fast, slow, sig)
+    return out
+
+
+# Largest-Triangle-Three-Buckets: indices of n_out points that preserve the shape of y
+@njit(cache=True)
+def lttb_indices(y, n_out):
+    n = y.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third triangle vertex
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += j
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        best = start
+        max_area = -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                best = j
+        idx[i + 1] = best
+        a = best
+    return idx
+
+
+# Compile every kernel once so the first real call doesn't pay JIT latency
+def warmup():
+    a = np.zeros(64)
+    all_indicators(a, 20, 20, 14, 12, 26, 9)
+    batch_indicators(np.zeros((2, 64)), 20, 20, 14, 12, 26, 9)
+    lttb_indices(a, 32)
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+
+# Split a v8 spark response ({"AAPL": {"timestamp": [...], "close": [...]}, ...})
+# into one Date/Close frame per symbol, limited to [start, end) like yf.download
+def parse_spark(payload, start, end):
+    frames = {}
+    for symbol, body in payload.items():
+        df = pd.DataFrame({
+            "Date": pd.to_datetime(np.asarray(body.get("timestamp") or [], dtype=np.int64), unit="s").normalize(),
+            "Close": np.asarray(body.get("close") or [], dtype=np.float64),
+        })
+        in_range = (df["Date"] >= pd.Timestamp(start)) & (df["Date"] < pd.Timestamp(end))
+        frames[body.get("symbol", symbol)] = df[in_range].reset_index(drop=True)
+    return frames
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the app's top-level modules importable from the tests
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
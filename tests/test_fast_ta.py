@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fast_ta import sma, ema, rsi, macd, all_indicators, batch_indicators
+
+# Fixed pseudo-random walk long enough for every warm-up period
+CLOSE = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 300))
+
+
+# Reference values built from pandas the same way the ta library does
+def ref_ema(s, w):
+    return s.ewm(span=w, min_periods=w, adjust=False).mean()
+
+
+def ref_rsi(s, w):
+    diff = s.diff(1)
+    up = diff.where(diff > 0, 0.0).ewm(alpha=1 / w, min_periods=w, adjust=False).mean()
+    down = -diff.where(diff < 0, 0.0).ewm(alpha=1 / w, min_periods=w, adjust=False).mean()
+    return pd.Series(np.where(down == 0, 100, 100 - 100 / (1 + up / down)), index=s.index)
+
+
+def leading_nans(a):
+    return int(np.argmax(~np.isnan(a)))
+
+
+def test_sma_matches_rolling_mean():
+    out = sma(CLOSE, 20)
+    np.testing.assert_allclose(out, pd.Series(CLOSE).rolling(20).mean(), equal_nan=True)
+    assert leading_nans(out) == 19
+
+
+def test_ema_matches_pandas_ewm():
+    out = ema(CLOSE, 20)
+    np.testing.assert_allclose(out, ref_ema(pd.Series(CLOSE), 20), equal_nan=True)
+    assert leading_nans(out) == 19
+
+
+def test_rsi_matches_wilder_smoothing():
+    out = rsi(CLOSE, 14)
+    np.testing.assert_allclose(out, ref_rsi(pd.Series(CLOSE), 14), equal_nan=True)
+    assert leading_nans(out) == 13
+
+
+def test_macd_matches_pandas_ewm():
+    line, signal = macd(CLOSE, 12, 26, 9)
+    s = pd.Series(CLOSE)
+    expected_line = ref_ema(s, 12) - ref_ema(s, 26)
+    np.testing.assert_allclose(line, expected_line, equal_nan=True)
+    np.testing.assert_allclose(signal, ref_ema(expected_line, 9), equal_nan=True)
+    assert leading_nans(line) == 25
+    assert leading_nans(signal) == 33
+
+
+def test_matches_ta_library():
+    ta = pytest.importorskip("ta")
+    s = pd.Series(CLOSE)
+    np.testing.assert_allclose(sma(CLOSE, 20), ta.trend.sma_indicator(close=s, window=20), equal_nan=True)
+    np.testing.assert_allclose(ema(CLOSE, 20), ta.trend.ema_indicator(close=s, window=20), equal_nan=True)
+    np.testing.assert_allclose(rsi(CLOSE, 14), ta.momentum.rsi(close=s, window=14), equal_nan=True)
+    line, signal = macd(CLOSE, 12, 26, 9)
+    expected = ta.trend.MACD(close=s)
+    np.testing.assert_allclose(line, expected.macd(), equal_nan=True)
+    np.testing.assert_allclose(signal, expected.macd_signal(), equal_nan=True)
+
+
+def test_all_indicators_matches_reference_kernels():
+    close = CLOSE.copy()
+    close[[40, 41, 150]] = np.nan
+    out = all_indicators(close, 20, 20, 14, 12, 26, 9)
+    line, signal = macd(close, 12, 26, 9)
+    expected = [sma(close, 20), ema(close, 20), rsi(close, 14), line, signal]
+    for col, ref in enumerate(expected):
+        np.testing.assert_allclose(out[:, col], ref, equal_nan=True, err_msg=f"column {col}")
+
+
+def test_batch_indicators_matches_per_row():
+    closes = np.stack([CLOSE, CLOSE[::-1].copy()])
+    out = batch_indicators(closes, 20, 20, 14, 12, 26, 9)
+    for k in range(closes.shape[0]):
+        np.testing.assert_allclose(out[k], all_indicators(closes[k], 20, 20, 14, 12, 26, 9), equal_nan=True)
+
+
+def test_batch_indicators_all_nan_row_stays_nan():
+    closes = np.stack([CLOSE, np.full(CLOSE.shape[0], np.nan)])
+    out = batch_indicators(closes, 20, 20, 14, 12, 26, 9)
+    assert np.isnan(out[1]).all()
+    assert not np.isnan(out[0, -1]).any()
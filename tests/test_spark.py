@@ -0,0 +1,30 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from spark import parse_spark
+
+FIXTURE = Path(__file__).parent / "fixtures" / "spark_v8.json"
+
+
+def load_fixture():
+    return json.loads(FIXTURE.read_text())
+
+
+def test_parse_spark_splits_symbols():
+    frames = parse_spark(load_fixture(), date(2024, 1, 1), date(2024, 1, 31))
+    assert list(frames) == ["AAPL", "MSFT"]
+    aapl = frames["AAPL"]
+    assert list(aapl.columns) == ["Date", "Close"]
+    assert list(aapl["Date"]) == list(pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]))
+    np.testing.assert_allclose(aapl["Close"], [185.64, 184.25, np.nan, 181.18], equal_nan=True)
+
+
+def test_parse_spark_slices_to_range():
+    # end is exclusive, matching yf.download
+    frames = parse_spark(load_fixture(), date(2024, 1, 3), date(2024, 1, 5))
+    assert list(frames["MSFT"]["Date"]) == list(pd.to_datetime(["2024-01-03", "2024-01-04"]))
+    np.testing.assert_allclose(frames["MSFT"]["Close"], [370.6, 367.94])